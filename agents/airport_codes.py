@@ -0,0 +1,57 @@
+"""
+Bundled catalog of IATA airport codes recognized in analytics queries.
+
+Covers every airport in the flights dataset (except DAY, see below) plus major
+US and international airports. It is not exhaustive: codes outside the catalog
+are still accepted by the query parser, the catalog only decides which tokens
+to prefer when a question contains more three-letter words than airports.
+"""
+
+import sys
+
+# Airports in the flights dataset (origins and destinations). DAY (Dayton) is left out:
+# it is also in NON_AIRPORT_WORDS, because "which day" questions would otherwise name it.
+_DATASET_AIRPORTS = '''
+    ABQ ACK ALB ANC ATL AUS AVL BDL BGR BHM BNA BOS BQN BTV BUF BUR BWI BZN
+    CAE CAK CHO CHS CLE CLT CMH CRW CVG DCA DEN DFW DSM DTW EGE EWR EYW
+    FLL GRR GSO GSP HDN HNL HOU IAD IAH ILM IND JAC JAX JFK LAS LAX LEX LGA
+    LGB MCI MCO MDW MEM MHT MIA MKE MSN MSP MSY MTJ MVY MYR OAK OKC OMA ORD
+    ORF PBI PDX PHL PHX PIT PSE PSP PVD PWM RDU RIC ROC RSW SAN SAT SAV SBN
+    SDF SEA SFO SJC SJU SLC SMF SNA SRQ STL STT SYR TPA TUL TVC TYS XNA
+'''
+
+# Other major US and Canadian airports not already listed above
+_NORTH_AMERICA_AIRPORTS = '''
+    BOI COS ELP FAT GEG ICT LIT OGG KOA LIH ITO PNS TLH TUS SGF FSD FAR RNO
+    MAF LBB AMA CRP HRL BTR SHV JAN MOB GPT CHA ECP DAB MLB PIE SFB VPS EUG
+    MFR RDM PSC SBA SBP MRY ONT FAI JNU BIL MSO GTF FCA SUN IDA TWF CID
+    DBQ MLI PIA BMI SPI FWA EVV LAN AZO FNT MBS GRB ATW LSE RST DLH HPN ISP
+    SWF ELM ITH BGM ACY ABE AVP MDT ERI HVN ORH PSM LEB BED MKG
+    YYZ YVR YUL YYC YEG YOW YWG YHZ YQB YXE YQR
+'''
+
+# Major international airports (CAN, Guangzhou, is left out as it is in NON_AIRPORT_WORDS)
+_INTERNATIONAL_AIRPORTS = '''
+    LHR LGW STN LTN MAN EDI GLA BHX BRS DUB SNN ORK CDG ORY NCE LYS MRS FRA
+    MUC DUS BER HAM STR CGN AMS BRU ZRH GVA VIE CPH ARN OSL HEL KEF MAD
+    BCN AGP PMI LIS OPO FCO MXP LIN VCE NAP ATH IST SAW PRG WAW BUD OTP SVO
+    DME LED TLV DXB AUH DOH BAH KWI RUH JED CAI CMN JNB CPT NBO ADD LOS ACC
+    DEL BOM BLR MAA CCU HYD KHI LHE ISB CMB DAC KTM BKK DMK HKT SIN KUL CGK
+    DPS MNL HKG MFM TPE KHH PEK PKX PVG SHA SZX CTU XIY ICN GMP NRT HND
+    KIX ITM NGO FUK CTS SYD MEL BNE PER ADL CBR AKL WLG CHC NAN PPT GRU GIG
+    EZE AEP SCL LIM BOG MDE UIO GYE CCS PTY SJO SAL GUA MEX CUN GDL MTY SJD
+    PVR HAV MBJ KIN NAS PUJ SDQ AUA CUR SXM BGI POS
+'''
+
+# Interned so the catalog shares one string object per code with the rest of the process
+AIRPORT_CODES: frozenset = frozenset(
+    sys.intern(code) for code in (_DATASET_AIRPORTS + _NORTH_AMERICA_AIRPORTS + _INTERNATIONAL_AIRPORTS).split()
+)
+
+# Common English 3-letter words that show up in questions but aren't meant as airports.
+# Kept to function words (plus DAY/FEW/TOP from phrases like "which day" and "top 5")
+# so real codes such as MAN, SET, SIT or VAN still parse as airports.
+NON_AIRPORT_WORDS: frozenset = frozenset(
+    'THE AND FOR ARE YOU TOP DAY FEW WHO WHY HOW CAN GET HAS HAD HIS HER HIM SHE '
+    'ITS OUR OUT ALL ANY NOT NOW NEW OLD TWO ONE YES WAS DID BUT SEE OWN'.split()
+)
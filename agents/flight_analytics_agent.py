@@ -1,27 +1,254 @@
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound, BadRequest, Forbidden
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 import re
+import threading
+import time
+
+from agents.airport_codes import AIRPORT_CODES, NON_AIRPORT_WORDS
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:  # Storage Read API is optional; results then download over REST
+    bigquery_storage = None
+
+try:
+    import pyarrow
+except ImportError:  # Without pyarrow, results are read row by row
+    pyarrow = None
+
+
+logger = logging.getLogger(__name__)
+
+# Using project from gcloud configuration: clear-heaven-462504-r3
+_PROJECT_ID = "clear-heaven-462504-r3"
+
+# Flight records queried by the analytics methods (see the class docstring for its expected layout)
+_FLIGHTS_TABLE = f"`{_PROJECT_ID}.flights.flights`"
+
+# Connection pool size for the BigQuery HTTP session, sized for concurrent queries
+_HTTP_POOL_SIZE = 20
+
+# Process-wide clients shared by every FlightAnalyticsAgent instance
+_CLIENT: Optional[bigquery.Client] = None
+_BQSTORAGE_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _create_client() -> bigquery.Client:
+    """Create a BigQuery client backed by an authorized session with a larger connection pool."""
+    # Initialize BigQuery client with Application Default Credentials
+    credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    
+    try:
+        # Let BigQuery run short queries inline without creating a job
+        return bigquery.Client(
+            project=_PROJECT_ID,
+            credentials=credentials,
+            _http=session,
+            default_job_creation_mode="JOB_CREATION_OPTIONAL",
+        )
+    except TypeError:
+        # Older client versions don't support optional job creation
+        return bigquery.Client(project=_PROJECT_ID, credentials=credentials, _http=session)
+
+
+def _get_clients() -> Tuple[bigquery.Client, Any]:
+    """
+    Return the shared BigQuery client and Storage Read client, creating them on first use.
+    
+    Client construction does credential discovery and sets up HTTP/gRPC transports,
+    so it is done once per process rather than once per agent instance.
+    """
+    global _CLIENT, _BQSTORAGE_CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = _create_client()
+            
+            # Storage Read API client for columnar result downloads, when installed
+            if bigquery_storage is not None:
+                try:
+                    _BQSTORAGE_CLIENT = bigquery_storage.BigQueryReadClient()
+                except Exception as storage_error:
+                    logger.warning("BigQuery Storage client unavailable, using REST downloads: %s", storage_error)
+        return _CLIENT, _BQSTORAGE_CLIENT
+
+
+def _exceeds_bytes_billed(error: BadRequest) -> bool:
+    """Return True if a BadRequest was raised because a query hit maximum_bytes_billed."""
+    return any(err.get('reason') == 'bytesBilledLimitExceeded' for err in (getattr(error, 'errors', None) or []))
+
+
+# Patterns and stop words used by _parse_query, compiled once at import time
+# Airport codes, years and limits found in one scan of the uppercased query. The limit
+# alternatives only look ahead at their digits, so "top 2019" or "2019 airlines" still
+# yield the year too; "top" is tried before "airport" so it isn't consumed as a code.
+_QUERY_TOKEN_RE = re.compile(
+    r'(?P<top>\bTOP\s+(?=(?P<top_n>\d+)\b))'
+    r'|(?P<airport>\b[A-Z]{3}\b)'
+    r'|(?P<airlines>\b(?=(?P<airlines_n>\d+)\s+AIRLINES\b))'
+    r'|(?P<year>\b(?:19|20)\d{2}\b)'
+)
+
+# Phrase matchers for query intent; plain alternations keep the original substring semantics
+_DAY_QUERY_RE = re.compile(r'day of week|which day|what day|weekday|monday|tuesday|wednesday|thursday|friday|saturday|sunday')
+_FOLLOW_UP_RE = re.compile(r'what about|how about|and for|which day|what day|fewer delays')
+_WHAT_ABOUT_RE = re.compile(r'what about|how about')
+
+# In-process result cache settings for the BigQuery-backed analytics methods
+_CACHE_TTL_SECONDS = 900
+_CACHE_MAX_ENTRIES = 256
+
+# Default hard ceiling on bytes billed per analytics query (5 GiB)
+_MAX_BYTES_BILLED = 5 * 1024 ** 3
+
+# Worker threads used to overlap BigQuery waits in analyze_flight_data_batch
+_MAX_QUERY_WORKERS = 8
+
+# Airlines on a route ranked by on-time performance. Each delay column is aggregated
+# once and the overall delay is derived from the averages. The year filter is a fixed
+# sentinel predicate, so this is the only SQL text the method ever sends.
+_ON_TIME_SQL = f"""
+    SELECT
+        carrier,
+        airline_name,
+        total_flights,
+        avg_dep_delay,
+        avg_arr_delay,
+        (avg_dep_delay + avg_arr_delay) / 2 as avg_overall_delay,
+        on_time_percentage
+    FROM (
+        SELECT
+            carrier,
+            name as airline_name,
+            COUNT(*) as total_flights,
+            AVG(IFNULL(dep_delay, 0)) as avg_dep_delay,
+            AVG(IFNULL(arr_delay, 0)) as avg_arr_delay,
+            AVG(IF(IFNULL(arr_delay, 0) <= 15, 1.0, 0.0)) * 100 as on_time_percentage
+        FROM
+            {_FLIGHTS_TABLE}
+        WHERE
+            origin = @origin
+            AND dest = @destination
+            AND carrier IS NOT NULL
+            AND name IS NOT NULL
+            AND (@year IS NULL OR year = @year)
+        GROUP BY
+            carrier, name
+        HAVING
+            COUNT(*) >= 10  -- Only include airlines with sufficient data
+    )
+    ORDER BY
+        avg_overall_delay ASC, on_time_percentage DESC
+    LIMIT @limit
+"""
+
+# Delays on a route by day of week. Day names and the best day come back from SQL,
+# and the overall delay is derived from the per-column averages.
+_DAY_OF_WEEK_SQL = f"""
+    WITH daily AS (
+        SELECT
+            FORMAT_DATE('%A', DATE(year, month, day)) as day_name,
+            COUNT(*) as total_flights,
+            AVG(IFNULL(dep_delay, 0)) as avg_dep_delay,
+            AVG(IFNULL(arr_delay, 0)) as avg_arr_delay,
+            AVG(IF(IFNULL(arr_delay, 0) <= 15, 1.0, 0.0)) * 100 as on_time_percentage
+        FROM
+            {_FLIGHTS_TABLE}
+        WHERE
+            origin = @origin
+            AND dest = @destination
+            AND year IS NOT NULL
+            AND month IS NOT NULL
+            AND day IS NOT NULL
+            AND (@year IS NULL OR year = @year)
+        GROUP BY
+            day_name
+        HAVING
+            COUNT(*) >= 5  -- Only include days with sufficient data
+    )
+    SELECT
+        day_name,
+        total_flights,
+        avg_dep_delay,
+        avg_arr_delay,
+        (avg_dep_delay + avg_arr_delay) / 2 as avg_overall_delay,
+        on_time_percentage,
+        ROW_NUMBER() OVER (ORDER BY avg_dep_delay + avg_arr_delay ASC) = 1 as is_best_day
+    FROM
+        daily
+    ORDER BY
+        avg_overall_delay ASC
+"""
+
+# Templates for the formatted analytics summaries
+_ON_TIME_HEADER = "Airlines ranked by on-time performance from {origin} to {destination}{year_text}:\n"
+_ON_TIME_FOOTER = (
+    "Note: On-time performance is defined as flights arriving within 15 minutes of scheduled time.\n"
+    "Airlines with fewer than 10 flights on this route are excluded from rankings."
+)
+_DAY_OF_WEEK_HEADER = "Flight delays by day of week from {origin} to {destination}{year_text}:\n"
+_BEST_DAY_LINE = "✅ **{day}** has the least delays with an average of {overall_delay:.1f} minutes overall delay."
+_ON_TIME_ROW = (
+    "#{rank}. {name} ({code})\n"
+    "    Average overall delay: {overall_delay:.1f} minutes\n"
+    "    Average departure delay: {dep_delay:.1f} minutes\n"
+    "    Average arrival delay: {arr_delay:.1f} minutes\n"
+    "    On-time performance: {on_time:.1f}% (≤15 min delay)\n"
+    "    Total flights analyzed: {total:,}\n"
+)
+_DAY_OF_WEEK_ROW = (
+    "#{rank}. {day}\n"
+    "    Average overall delay: {overall_delay:.1f} minutes\n"
+    "    Average departure delay: {dep_delay:.1f} minutes\n"
+    "    Average arrival delay: {arr_delay:.1f} minutes\n"
+    "    On-time performance: {on_time:.1f}%\n"
+    "    Total flights: {total:,}\n"
+)
 
 
 class FlightAnalyticsAgent:
-    """Agent responsible for performing analytics queries on flight data using Google BigQuery."""
+    """
+    Agent responsible for performing analytics queries on flight data using Google BigQuery.
+    
+    Every query filters the flights table on origin, dest and (optionally) year, so the
+    table should be clustered on those columns; otherwise each call scans, and bills,
+    the whole table. For a fresh project, set this up once with:
     
-    def __init__(self):
+        bq update --clustering_fields=origin,dest,year clear-heaven-462504-r3:flights.flights
+    
+    The year filter is a single ``(@year IS NULL OR year = @year)`` predicate, so each
+    method always sends byte-identical SQL and repeated questions can be answered from
+    BigQuery's query result cache.
+    """
+    
+    def __init__(self, max_bytes_billed: Optional[int] = _MAX_BYTES_BILLED):
         """
         Initialize the FlightAnalyticsAgent with BigQuery client using Application Default Credentials.
         
+        Args:
+            max_bytes_billed (int, optional): Hard ceiling on bytes billed per query; BigQuery
+                fails any query that would exceed it before billing. Defaults to 5 GiB.
+                Pass None to disable the ceiling.
+        
         Raises:
             Exception: If BigQuery client initialization fails
         """
         try:
-            # Initialize BigQuery client with Application Default Credentials
-            # Using project from gcloud configuration: clear-heaven-462504-r3
-            self.client = bigquery.Client(project="clear-heaven-462504-r3")
-            # Set up logging for debugging - only show warnings and errors
-            logging.basicConfig(level=logging.WARNING)
-            self.logger = logging.getLogger(__name__)
+            self.max_bytes_billed = max_bytes_billed
+            
+            # Reuse the process-wide BigQuery clients
+            self.client, self._bqstorage = _get_clients()
+            self.logger = logger
             
             # Initialize conversational memory
             self.memory: Dict[str, Any] = {
@@ -31,6 +258,17 @@ class FlightAnalyticsAgent:
                 'last_year': None,
                 'last_limit': None
             }
+            
+            # Cache of formatted results keyed by (method, origin, destination, year, limit)
+            self._cache: Dict[Tuple, Tuple[float, str]] = {}
+            self._cache_lock = threading.Lock()
+            
+            # Most recent (parse key, parse), reused when the same question is asked against
+            # unchanged memory; one tuple so concurrent parses can't pair a key with another's result
+            self._last_parse: Tuple[Optional[Tuple], Dict[str, Any]] = (None, {})
+            
+            # Thread pool for running independent BigQuery queries concurrently
+            self._executor = ThreadPoolExecutor(max_workers=_MAX_QUERY_WORKERS)
         except Exception as e:
             raise Exception(f"Failed to initialize BigQuery client: {str(e)}")
     
@@ -52,28 +290,8 @@ class FlightAnalyticsAgent:
             if 'error' in parsed_query:
                 return parsed_query['error']
             
-            # Route to appropriate analysis method
-            if parsed_query['type'] == 'day_of_week_delays':
-                result = self.get_day_of_week_delays(
-                    origin=parsed_query['origin'],
-                    destination=parsed_query['destination'],
-                    year=parsed_query.get('year')
-                )
-            elif parsed_query['type'] == 'on_time_airlines':
-                result = self.get_on_time_airlines(
-                    origin=parsed_query['origin'],
-                    destination=parsed_query['destination'],
-                    year=parsed_query.get('year'),
-                    limit=parsed_query.get('limit', 10)
-                )
-            else:
-                # Default to on-time airlines analysis
-                result = self.get_on_time_airlines(
-                    origin=parsed_query['origin'],
-                    destination=parsed_query['destination'],
-                    year=parsed_query.get('year'),
-                    limit=parsed_query.get('limit', 10)
-                )
+            # Run the matching analysis method
+            result = self._run_analysis(parsed_query)
             
             # Update memory with this query
             self._update_memory(parsed_query)
@@ -81,38 +299,140 @@ class FlightAnalyticsAgent:
             return result
             
         except Exception as e:
-            self.logger.error(f"Error in analyze_flight_data: {str(e)}")
+            self.logger.error("Error in analyze_flight_data: %s", e)
             return f"😅 I encountered an error while analyzing your query: {str(e)}"
     
+    async def analyze_flight_data_async(self, query: str) -> str:
+        """
+        Awaitable version of analyze_flight_data for use inside an event loop.
+        
+        The blocking BigQuery work runs on the agent's thread pool, so many chat
+        sessions can wait on their queries concurrently without blocking the loop.
+        Calls on the same agent share its conversational memory, so await them one
+        at a time within a conversation.
+        
+        Args:
+            query (str): Natural language query about flight data
+            
+        Returns:
+            str: Analysis results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.analyze_flight_data, query)
+    
+    def analyze_flight_data_batch(self, queries: List[str]) -> List[str]:
+        """
+        Analyze several natural language queries, running their BigQuery jobs concurrently.
+        
+        Queries are parsed in order so follow-ups still resolve against the memory left
+        by the query before them; only the BigQuery work runs in parallel.
+        
+        Args:
+            queries (List[str]): Natural language queries about flight data
+            
+        Returns:
+            List[str]: Analysis results, in the same order as the queries
+        """
+        pending: List[Union[Future, str]] = []
+        for query in queries:
+            try:
+                parsed_query = self._parse_query(query)
+                
+                if 'error' in parsed_query:
+                    pending.append(parsed_query['error'])
+                    continue
+                
+                pending.append(self._executor.submit(self._run_analysis, parsed_query))
+                self._update_memory(parsed_query)
+            except Exception as e:
+                self.logger.error("Error in analyze_flight_data_batch: %s", e)
+                pending.append(f"😅 I encountered an error while analyzing your query: {str(e)}")
+        
+        results = []
+        for item in pending:
+            if isinstance(item, Future):
+                try:
+                    item = item.result()
+                except Exception as e:
+                    self.logger.error("Error in analyze_flight_data_batch: %s", e)
+                    item = f"😅 I encountered an error while analyzing your query: {str(e)}"
+            results.append(item)
+        return results
+    
+    def _run_analysis(self, parsed_query: Dict[str, Any]) -> str:
+        """Run the analysis method matching a parsed query's type."""
+        if parsed_query['type'] == 'day_of_week_delays':
+            return self.get_day_of_week_delays(
+                origin=parsed_query['origin'],
+                destination=parsed_query['destination'],
+                year=parsed_query.get('year')
+            )
+        
+        # Default to on-time airlines analysis
+        return self.get_on_time_airlines(
+            origin=parsed_query['origin'],
+            destination=parsed_query['destination'],
+            year=parsed_query.get('year'),
+            limit=parsed_query.get('limit', 10)
+        )
+    
     def _parse_query(self, query: str) -> Dict[str, Any]:
         """
         Parse natural language query to extract intent and parameters.
         Uses conversational memory for context.
         """
         query_lower = query.lower()
+        
+        # The parse depends only on the query text and the memory, so a repeat of the
+        # last question against unchanged memory can reuse the previous result
+        parse_key = (query_lower, tuple(self.memory.values()))
+        last_key, parsed = self._last_parse  # Read once; the pair is replaced as a whole
+        if parse_key != last_key:
+            parsed = self._extract_query_params(query, query_lower)
+            self._last_parse = (parse_key, parsed)
+        return dict(parsed)
+    
+    def _extract_query_params(self, query: str, query_lower: str) -> Dict[str, Any]:
+        """Extract intent, airports, year and limit from a query, filling gaps from memory."""
         parsed: Dict[str, Any] = {}
+        is_what_about = bool(_WHAT_ABOUT_RE.search(query_lower))
         
         # Determine query type
-        if any(phrase in query_lower for phrase in ['day of week', 'which day', 'what day', 'weekday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']):
+        if _DAY_QUERY_RE.search(query_lower):
             parsed['type'] = 'day_of_week_delays'
         else:
             parsed['type'] = 'on_time_airlines'
         
-        # Extract airport codes - look for 3-letter codes that are likely airports
+        # Extract airport codes, the first year and the first limit in a single pass
         # Common patterns: "from SFO to JFK", "SFO to JFK", "SFO-JFK", etc.
-        airport_pattern = r'\b([A-Z]{3})\b'
-        potential_codes = re.findall(airport_pattern, query.upper())
+        airport_codes = []
+        year = None
+        limit = None
+        for match in _QUERY_TOKEN_RE.finditer(query.upper()):
+            kind = match.lastgroup
+            if kind == 'airport':
+                # Filter out common non-airport 3-letter words
+                code = match.group('airport')
+                if code not in NON_AIRPORT_WORDS:
+                    airport_codes.append(code)
+            elif kind == 'year':
+                if year is None:
+                    year = int(match.group('year'))
+            elif limit is None:
+                limit = int(match.group('top_n') or match.group('airlines_n'))
         
-        # Filter out common non-airport 3-letter words
-        common_words = {'THE', 'AND', 'FOR', 'ARE', 'YOU', 'TOP', 'DAY', 'HAS', 'FEW', 'WHO', 'WHY', 'HOW', 'CAN', 'GET', 'SET', 'RUN', 'NEW', 'OLD', 'BIG', 'BAD', 'END', 'USE', 'WAY', 'MAN', 'SEE', 'HIM', 'TWO', 'NOW', 'ITS', 'DID', 'YES', 'HIS', 'HER', 'SHE', 'HAS', 'HAD', 'HIS', 'HER', 'HIM', 'WHO', 'OIL', 'SIT', 'SET', 'BUT', 'NOT', 'ALL', 'ANY', 'CAN', 'HAD', 'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'TRY', 'WAY', 'WIN', 'OWN', 'SAY', 'TOO', 'USE', 'TWO', 'NEW', 'NOW', 'OLD', 'SEE', 'HIM', 'ITS', 'LET', 'PUT', 'END', 'WHY', 'TRY', 'ASK', 'RUN', 'OWN', 'SIT', 'SET', 'GET', 'GOT', 'HAS', 'HIT', 'HOT', 'JOB', 'LET', 'LOT', 'MAP', 'MEN', 'NET', 'PET', 'RUN', 'SUN', 'TEN', 'VAN', 'WIN', 'YES', 'YET', 'ZOO'}
-        airport_codes = [code for code in potential_codes if code not in common_words]
+        # Prefer catalogued airports when the query names at least two of them, so stray
+        # 3-letter words ("which way from SFO to JFK") are skipped; otherwise keep every candidate
+        known_codes = [code for code in airport_codes if code in AIRPORT_CODES]
+        if len(known_codes) >= 2:
+            airport_codes = known_codes
         
         if len(airport_codes) >= 2:
             parsed['origin'] = airport_codes[0]
             parsed['destination'] = airport_codes[1]
         elif len(airport_codes) == 1:
             # Use conversational memory to fill in missing airport
-            if 'what about' in query_lower or 'how about' in query_lower:
+            if is_what_about:
                 if self.memory['last_origin'] and self.memory['last_destination']:
                     # User is asking about a different route, try to determine which airport changed
                     if airport_codes[0] != self.memory['last_origin'] and airport_codes[0] != self.memory['last_destination']:
@@ -128,14 +448,13 @@ class FlightAnalyticsAgent:
                 return {'error': '✈️ I need both airports to help you! Try something like "SFO to JFK" or "from LAX to ORD"'}
         elif len(airport_codes) == 0:
             # No airports found, check if this is a follow-up question or if we should use memory
-            follow_up_phrases = ['what about', 'how about', 'and for', 'which day', 'what day', 'fewer delays']
-            if (any(phrase in query_lower for phrase in follow_up_phrases) and 
+            if (_FOLLOW_UP_RE.search(query_lower) and 
                 self.memory['last_origin'] and self.memory['last_destination']):
                 # Use memory for airports
                 parsed['origin'] = self.memory['last_origin']
                 parsed['destination'] = self.memory['last_destination']
                 # For questions without specific airports but asking about analysis, use memory context
-                if 'what about' in query_lower or 'how about' in query_lower:
+                if is_what_about:
                     # For "what about" questions, preserve the analysis type unless explicitly changed
                     if parsed['type'] == 'on_time_airlines' and self.memory['last_query_type']:
                         parsed['type'] = self.memory['last_query_type']
@@ -144,18 +463,16 @@ class FlightAnalyticsAgent:
         else:
             return {'error': '✈️ I need both airports to help you! Try something like "SFO to JFK" or "from LAX to ORD"'}
         
-        # Extract year if mentioned
-        year_match = re.search(r'\b(19|20)\d{2}\b', query)
-        if year_match:
-            parsed['year'] = int(year_match.group())
-        elif self.memory['last_year'] and ('what about' in query_lower or 'how about' in query_lower):
+        # Use the year if mentioned
+        if year is not None:
+            parsed['year'] = year
+        elif self.memory['last_year'] and is_what_about:
             parsed['year'] = self.memory['last_year']
         
-        # Extract limit if mentioned
-        limit_match = re.search(r'\btop\s+(\d+)\b|\b(\d+)\s+airlines\b', query_lower)
-        if limit_match:
-            parsed['limit'] = int(limit_match.group(1) or limit_match.group(2))
-        elif self.memory['last_limit'] and ('what about' in query_lower or 'how about' in query_lower):
+        # Use the limit if mentioned
+        if limit is not None:
+            parsed['limit'] = limit
+        elif self.memory['last_limit'] and is_what_about:
             parsed['limit'] = self.memory['last_limit']
         
         return parsed
@@ -168,6 +485,64 @@ class FlightAnalyticsAgent:
         self.memory['last_year'] = parsed_query.get('year')
         self.memory['last_limit'] = parsed_query.get('limit')
     
+    def _cache_get(self, key: Tuple) -> Optional[str]:
+        """Return the cached result for key, or None if missing or expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, result = entry
+            if time.monotonic() - stored_at > _CACHE_TTL_SECONDS:
+                self._cache.pop(key, None)
+                return None
+            return result
+    
+    def _cache_put(self, key: Tuple, result: str):
+        """Store a formatted result, evicting the oldest entry when the cache is full."""
+        with self._cache_lock:
+            if key not in self._cache and len(self._cache) >= _CACHE_MAX_ENTRIES:
+                # Dicts preserve insertion order, so the first key is the oldest
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (time.monotonic(), result)
+    
+    def clear_cache(self):
+        """Drop all cached analytics results so the next queries hit BigQuery again."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def close(self):
+        """Stop the query worker threads; the shared BigQuery clients stay open for other agents."""
+        self._executor.shutdown(wait=True)  # Lets in-flight queries finish first
+    
+    def _run_query(self, query: str, job_config: bigquery.QueryJobConfig, page_size: Optional[int] = None):
+        """
+        Execute a query and wait for its results.
+        
+        Prefers query_and_wait, which issues a single jobs.query call (and, with
+        optional job creation, no job at all for short queries) instead of
+        jobs.insert followed by getQueryResults. Passing page_size as the maximum
+        row count returns the whole result in the first page, with no follow-up
+        page requests.
+        """
+        if hasattr(self.client, "query_and_wait"):
+            return self.client.query_and_wait(query, job_config=job_config, page_size=page_size)
+        return self.client.query(query, job_config=job_config).result(page_size=page_size)
+    
+    def _fetch_rows(self, results) -> List[tuple]:
+        """
+        Download query results as Arrow columns and return them as tuples in SELECT order.
+        
+        Decoding columns in bulk avoids materializing a Row object per result and
+        reading every field through Row.__getattr__.
+        """
+        if pyarrow is None:
+            # Row.values() returns fields positionally in SELECT order, skipping name lookups
+            return [row.values() for row in results]
+        
+        table = results.to_arrow(bqstorage_client=self._bqstorage, create_bqstorage_client=False)
+        return list(zip(*(column.to_pylist() for column in table.columns)))
+    
     def get_on_time_airlines(self, origin: str, destination: str, year: Optional[int] = None, limit: int = 10) -> str:
         """
         Analyze on-time performance of airlines for flights between two airports.
@@ -193,90 +568,78 @@ class FlightAnalyticsAgent:
             if limit < 1 or limit > 50:
                 return "📊 I can show you between 1 and 50 airlines. How about picking a number in that range?"
             
-            # Build base query for on-time performance analysis
-            base_query = """
-            SELECT
-                carrier,
-                name as airline_name,
-                COUNT(*) as total_flights,
-                AVG(COALESCE(dep_delay, 0)) as avg_dep_delay,
-                AVG(COALESCE(arr_delay, 0)) as avg_arr_delay,
-                AVG((COALESCE(dep_delay, 0) + COALESCE(arr_delay, 0)) / 2) as avg_overall_delay,
-                SUM(CASE WHEN COALESCE(arr_delay, 0) <= 15 THEN 1 ELSE 0 END) / COUNT(*) * 100 as on_time_percentage
-            FROM
-                `clear-heaven-462504-r3.flights.flights`
-            WHERE
-                origin = @origin
-                AND dest = @destination
-                AND carrier IS NOT NULL
-                AND name IS NOT NULL
-            """
-            
-            # Add year filter if specified
+            # Normalize airport codes once for the cache key, query parameters and summary
+            origin, destination = origin.upper(), destination.upper()
+            
+            # Serve repeated questions from the in-process cache
+            cache_key = ("on_time", origin, destination, year, limit)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # The year parameter is always bound (NULL means all years) so the SQL text never changes
             query_parameters = [
-                bigquery.ScalarQueryParameter("origin", "STRING", origin.upper()),
-                bigquery.ScalarQueryParameter("destination", "STRING", destination.upper()),
+                bigquery.ScalarQueryParameter("origin", "STRING", origin),
+                bigquery.ScalarQueryParameter("destination", "STRING", destination),
+                bigquery.ScalarQueryParameter("year", "INT64", year),
                 bigquery.ScalarQueryParameter("limit", "INT64", limit),
             ]
             
-            if year is not None:
-                base_query += " AND year = @year"
-                query_parameters.append(bigquery.ScalarQueryParameter("year", "INT64", year))
-            
-            # Complete the query with grouping and ordering
-            query = base_query + """
-            GROUP BY
-                carrier, name
-            HAVING
-                COUNT(*) >= 10  -- Only include airlines with sufficient data
-            ORDER BY 
-                avg_overall_delay ASC, on_time_percentage DESC
-            LIMIT @limit
-            """
-            
-            # Configure query parameters to prevent SQL injection
-            job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+            # Configure query parameters to prevent SQL injection; identical SQL and
+            # parameters are then served from BigQuery's 24h result cache
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=query_parameters,
+                use_query_cache=True,
+                use_legacy_sql=False,
+                maximum_bytes_billed=self.max_bytes_billed,
+            )
             
             # Execute the query
             year_str = f" in {year}" if year else ""
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()  # Wait for query completion
+            results = self._run_query(_ON_TIME_SQL, job_config, page_size=limit)  # Wait for query completion
             
-            # Convert results to list for processing
-            airlines = list(results)
+            # Convert results to row tuples for processing
+            airlines = self._fetch_rows(results)
             
             # Handle case when no data is found
             if not airlines:
                 year_clause = f" in {year}" if year else ""
-                return f"🔍 I couldn't find any flights on that route{year_clause}. This might be because it's not a common route or the data is limited. Try a major city pair like SFO to JFK!"
+                result = f"🔍 I couldn't find any flights on that route{year_clause}. This might be because it's not a common route or the data is limited. Try a major city pair like SFO to JFK!"
+                self._cache_put(cache_key, result)
+                return result
             
             # Format results into human-readable summary
             year_text = f" in {year}" if year else ""
-            summary = f"Airlines ranked by on-time performance from {origin.upper()} to {destination.upper()}{year_text}:\n\n"
+            parts = [_ON_TIME_HEADER.format(origin=origin, destination=destination, year_text=year_text)]
             
-            for i, airline in enumerate(airlines, 1):
+            for i, (carrier, name, total, dep_delay, arr_delay, overall_delay, on_time) in enumerate(airlines, 1):
                 # Extract airline details with safe defaults
-                carrier_code = airline.carrier or "Unknown"
-                airline_name = airline.airline_name or f"Carrier {carrier_code}"
-                total_flights = airline.total_flights or 0
-                avg_dep_delay = airline.avg_dep_delay or 0
-                avg_arr_delay = airline.avg_arr_delay or 0
-                avg_overall_delay = airline.avg_overall_delay or 0
-                on_time_percentage = airline.on_time_percentage or 0
+                carrier_code = carrier or "Unknown"
+                airline_name = name or f"Carrier {carrier_code}"
+                total_flights = total or 0
+                avg_dep_delay = dep_delay or 0
+                avg_arr_delay = arr_delay or 0
+                avg_overall_delay = overall_delay or 0
+                on_time_percentage = on_time or 0
                 
-                # Format individual airline entry
-                summary += f"#{i}. {airline_name} ({carrier_code})\n"
-                summary += f"    Average overall delay: {avg_overall_delay:.1f} minutes\n"
-                summary += f"    Average departure delay: {avg_dep_delay:.1f} minutes\n" 
-                summary += f"    Average arrival delay: {avg_arr_delay:.1f} minutes\n"
-                summary += f"    On-time performance: {on_time_percentage:.1f}% (≤15 min delay)\n"
-                summary += f"    Total flights analyzed: {total_flights:,}\n\n"
+                # Format individual airline entry as a single string
+                parts.append(_ON_TIME_ROW.format(
+                    rank=i,
+                    name=airline_name,
+                    code=carrier_code,
+                    overall_delay=avg_overall_delay,
+                    dep_delay=avg_dep_delay,
+                    arr_delay=avg_arr_delay,
+                    on_time=on_time_percentage,
+                    total=total_flights,
+                ))
             
             # Add helpful context information
-            summary += "Note: On-time performance is defined as flights arriving within 15 minutes of scheduled time.\n"
-            summary += "Airlines with fewer than 10 flights on this route are excluded from rankings."
-                
-            return summary.strip()
+            parts.append(_ON_TIME_FOOTER)
+            
+            result = "\n".join(parts).strip()
+            self._cache_put(cache_key, result)
+            return result
             
         except NotFound:
             return "🔧 I'm having trouble accessing the flight database. This is usually temporary - please try again in a moment!"
@@ -285,10 +648,12 @@ class FlightAnalyticsAgent:
             return "🔐 I don't have permission to access the flight data right now. This should be fixed soon!"
             
         except BadRequest as e:
+            if _exceeds_bytes_billed(e):
+                return "💸 That question would scan more flight data than I'm allowed to in one go. Try narrowing it down to a specific year!"
             return f"🤔 Something about that request didn't work quite right. Could you try rephrasing? (Technical details: {str(e)})"
             
         except Exception as e:
-            self.logger.error(f"Unexpected error in get_on_time_airlines: {str(e)}")
+            self.logger.error("Unexpected error in get_on_time_airlines: %s", e)
             return f"😅 Something unexpected happened while looking up airline performance. Please try again! (Details: {str(e)})"
     
     def get_day_of_week_delays(self, origin: str, destination: str, year: Optional[int] = None) -> str:
@@ -311,94 +676,79 @@ class FlightAnalyticsAgent:
             if year is not None and (year < 1990 or year > 2030):
                 return "📅 That year seems outside my range! Could you try a year between 1990 and 2030?"
             
-            # Build query for day-of-week analysis
-            base_query = """
-            SELECT
-                EXTRACT(DAYOFWEEK FROM DATE(year, month, day)) as day_of_week,
-                COUNT(*) as total_flights,
-                AVG(COALESCE(dep_delay, 0)) as avg_dep_delay,
-                AVG(COALESCE(arr_delay, 0)) as avg_arr_delay,
-                AVG((COALESCE(dep_delay, 0) + COALESCE(arr_delay, 0)) / 2) as avg_overall_delay,
-                SUM(CASE WHEN COALESCE(arr_delay, 0) <= 15 THEN 1 ELSE 0 END) / COUNT(*) * 100 as on_time_percentage
-            FROM
-                `clear-heaven-462504-r3.flights.flights`
-            WHERE
-                origin = @origin
-                AND dest = @destination
-                AND year IS NOT NULL
-                AND month IS NOT NULL
-                AND day IS NOT NULL
-            """
-            
-            # Add year filter if specified
-            query_parameters = [
-                bigquery.ScalarQueryParameter("origin", "STRING", origin.upper()),
-                bigquery.ScalarQueryParameter("destination", "STRING", destination.upper()),
-            ]
+            # Normalize airport codes once for the cache key, query parameters and summary
+            origin, destination = origin.upper(), destination.upper()
             
-            if year is not None:
-                base_query += " AND year = @year"
-                query_parameters.append(bigquery.ScalarQueryParameter("year", "INT64", year))
+            # Serve repeated questions from the in-process cache
+            cache_key = ("day_of_week", origin, destination, year, None)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Complete the query with grouping and ordering
-            query = base_query + """
-            GROUP BY
-                day_of_week
-            HAVING
-                COUNT(*) >= 5  -- Only include days with sufficient data
-            ORDER BY 
-                avg_overall_delay ASC
-            """
+            # The year parameter is always bound (NULL means all years) so the SQL text never changes
+            query_parameters = [
+                bigquery.ScalarQueryParameter("origin", "STRING", origin),
+                bigquery.ScalarQueryParameter("destination", "STRING", destination),
+                bigquery.ScalarQueryParameter("year", "INT64", year),
+            ]
             
-            # Configure query parameters
-            job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+            # Configure query parameters; identical SQL and parameters are served from
+            # BigQuery's 24h result cache
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=query_parameters,
+                use_query_cache=True,
+                use_legacy_sql=False,
+                maximum_bytes_billed=self.max_bytes_billed,
+            )
             
             # Execute the query
             year_str = f" in {year}" if year else ""
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
+            results = self._run_query(_DAY_OF_WEEK_SQL, job_config, page_size=7)  # At most one row per day
             
-            # Convert results to list for processing
-            day_data = list(results)
+            # Convert results to row tuples for processing
+            day_data = self._fetch_rows(results)
             
             # Handle case when no data is found
             if not day_data:
                 year_clause = f" in {year}" if year else ""
-                return f"🔍 I couldn't find any flights on that route{year_clause}. Try a popular route like JFK to ORD!"
-            
-            # Map day numbers to day names (BigQuery DAYOFWEEK: 1=Sunday, 2=Monday, etc.)
-            day_names = {
-                1: "Sunday", 2: "Monday", 3: "Tuesday", 4: "Wednesday",
-                5: "Thursday", 6: "Friday", 7: "Saturday"
-            }
+                result = f"🔍 I couldn't find any flights on that route{year_clause}. Try a popular route like JFK to ORD!"
+                self._cache_put(cache_key, result)
+                return result
             
             # Format results
             year_text = f" in {year}" if year else ""
-            summary = f"Flight delays by day of week from {origin.upper()} to {destination.upper()}{year_text}:\n\n"
-            
-            for i, day in enumerate(day_data, 1):
-                day_name = day_names.get(day.day_of_week, f"Day {day.day_of_week}")
-                total_flights = day.total_flights or 0
-                avg_dep_delay = day.avg_dep_delay or 0
-                avg_arr_delay = day.avg_arr_delay or 0
-                avg_overall_delay = day.avg_overall_delay or 0
-                on_time_percentage = day.on_time_percentage or 0
+            parts = [_DAY_OF_WEEK_HEADER.format(origin=origin, destination=destination, year_text=year_text)]
+            
+            best_day = None
+            for i, (day_name, total, dep_delay, arr_delay, overall_delay, on_time, is_best_day) in enumerate(day_data, 1):
+                total_flights = total or 0
+                avg_dep_delay = dep_delay or 0
+                avg_arr_delay = arr_delay or 0
+                avg_overall_delay = overall_delay or 0
+                on_time_percentage = on_time or 0
+                
+                # Format individual day entry as a single string
+                parts.append(_DAY_OF_WEEK_ROW.format(
+                    rank=i,
+                    day=day_name,
+                    overall_delay=avg_overall_delay,
+                    dep_delay=avg_dep_delay,
+                    arr_delay=avg_arr_delay,
+                    on_time=on_time_percentage,
+                    total=total_flights,
+                ))
                 
-                # Format individual day entry
-                summary += f"#{i}. {day_name}\n"
-                summary += f"    Average overall delay: {avg_overall_delay:.1f} minutes\n"
-                summary += f"    Average departure delay: {avg_dep_delay:.1f} minutes\n"
-                summary += f"    Average arrival delay: {avg_arr_delay:.1f} minutes\n"
-                summary += f"    On-time performance: {on_time_percentage:.1f}%\n"
-                summary += f"    Total flights: {total_flights:,}\n\n"
-            
-            # Find the best day
-            if day_data:
-                best_day = min(day_data, key=lambda x: x.avg_overall_delay or float('inf'))
-                best_day_name = day_names.get(best_day.day_of_week, f"Day {best_day.day_of_week}")
-                summary += f"✅ **{best_day_name}** has the least delays with an average of {best_day.avg_overall_delay:.1f} minutes overall delay."
-            
-            return summary.strip()
+                if is_best_day:
+                    best_day = (day_name, avg_overall_delay)
+            
+            # Call out the best day flagged by the query
+            if best_day:
+                best_day_name, best_overall_delay = best_day
+                parts.append(_BEST_DAY_LINE.format(day=best_day_name, overall_delay=best_overall_delay))
+            
+            result = "\n".join(parts).strip()
+            self._cache_put(cache_key, result)
+            return result
             
         except NotFound:
             return "🔧 I'm having trouble accessing the flight database. Please try again in a moment!"
@@ -407,10 +757,12 @@ class FlightAnalyticsAgent:
             return "🔐 I don't have permission to access the flight data right now. Should be back up soon!"
             
         except BadRequest as e:
+            if _exceeds_bytes_billed(e):
+                return "💸 That question would scan more flight data than I'm allowed to in one go. Try narrowing it down to a specific year!"
             return f"🤔 Something about that request needs tweaking. Could you rephrase it? (Technical: {str(e)})"
             
         except Exception as e:
-            self.logger.error(f"Unexpected error in get_day_of_week_delays: {str(e)}")
+            self.logger.error("Unexpected error in get_day_of_week_delays: %s", e)
             return f"😅 I hit an unexpected snag analyzing those delays. Please try again! (Details: {str(e)})"
     
     def test_routing(self) -> str:
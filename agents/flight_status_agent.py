@@ -1,19 +1,104 @@
-import requests
-from typing import Optional
+import asyncio
+import httpx
+import orjson
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+# Seconds a successful status lookup stays cached, by AviationStack flight_status.
+# Flights in the air change quickly; scheduled and finished flights rarely do.
+_STATUS_CACHE_TTLS = {
+    'scheduled': 600,
+    'active': 60,
+    'en-route': 60,
+    'landed': 900,
+    'cancelled': 900,
+}
+_DEFAULT_STATUS_TTL = 120
+_STATUS_CACHE_MAX_ENTRIES = 512
+
+# The only parts of an AviationStack flight record this agent reads
+_PROJECTED_SECTIONS = {
+    'airline': ('name',),
+    'departure': ('airport', 'scheduled', 'actual'),
+    'arrival': ('airport', 'scheduled', 'estimated'),
+}
+
+# AviationStack endpoint. The free plan only accepts plain HTTP (HTTPS requests fail with
+# https_access_restricted); paid plans can pass the https:// URL as base_url.
+_DEFAULT_BASE_URL = "http://api.aviationstack.com/v1"
+
+# Connection settings shared by the sync and async AviationStack clients
+_REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+_CONNECT_RETRIES = 2
+
+# Concurrent lookups when several flights are requested at once
+_MAX_LOOKUP_WORKERS = 8
+
+# Display names for AviationStack's flight_status values
+_STATUS_LABELS = {
+    'scheduled': 'Scheduled',
+    'active': 'En route',
+    'landed': 'Landed',
+    'cancelled': 'Cancelled',
+    'incident': 'Incident',
+    'diverted': 'Diverted',
+}
+
+
+def _project(flight_data: dict) -> dict:
+    """
+    Reduce an AviationStack flight record to the fields the status message uses.
+    
+    Keeps flight_status plus airline name, departure airport/scheduled/actual and
+    arrival airport/scheduled/estimated; keys missing upstream stay missing. Nothing
+    else from the record (codeshares, aircraft, live telemetry, ...) is passed on,
+    so callers must not come to rely on it.
+    """
+    projected = {'flight_status': flight_data.get('flight_status')}
+    for section, keys in _PROJECTED_SECTIONS.items():
+        values = flight_data.get(section) or {}
+        projected[section] = {key: values[key] for key in keys if key in values}
+    return projected
+
+
+def _short(timestamp: Optional[str]) -> str:
+    """Trim an ISO-8601 timestamp to YYYY-MM-DDTHH:MM, or 'N/A' when it is missing."""
+    return timestamp[:16] if timestamp else 'N/A'
 
 
 class FlightStatusAgent:
     """Agent responsible for fetching real-time flight status information from AviationStack API."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = _DEFAULT_BASE_URL):
         """
         Initialize the FlightStatusAgent with AviationStack API credentials.
         
         Args:
             api_key (str): AviationStack API access key
+            base_url (str): AviationStack API root. Defaults to the plain-HTTP endpoint the
+                free plan requires; pass "https://api.aviationstack.com/v1" on a paid plan.
         """
         self.api_key = api_key
-        self.base_url = "http://api.aviationstack.com/v1/flights"
+        self.base_url = base_url
+        
+        # Reuse one client so repeated and concurrent lookups share a keep-alive
+        # connection (HTTP/2 when base_url is HTTPS); failed connects are retried
+        transport = httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=8),
+            retries=_CONNECT_RETRIES,
+        )
+        self.client = httpx.Client(transport=transport, **self._client_options())
+        
+        # Successful lookups keyed by uppercased flight number -> (expires_at, status message)
+        self._cache = {}
+        self._cache_lock = threading.RLock()
+        
+        # Worker threads for batch lookups; they share the pooled client
+        self._executor = ThreadPoolExecutor(max_workers=_MAX_LOOKUP_WORKERS)
     
     def get_status(self, flight_number: str) -> str:
         """
@@ -26,63 +111,236 @@ class FlightStatusAgent:
             str: Human-readable flight status information
         """
         try:
-            # Prepare API request parametersGEMINI_API_KEY
-            params = {
-                'access_key': self.api_key,
-                'flight_iata': flight_number.upper()  # Ensure uppercase for consistency
-            }
-            
-            # Make request to AviationStack API with timeout
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()  # Raise exception for HTTP errors
+            # Serve repeated lookups for the same flight from the in-process cache
+            flight_iata = flight_number.upper()
+            cached = self._cache_get(flight_iata)
+            if cached is not None:
+                return cached
             
-            data = response.json()
+            # Make request to AviationStack API (the access key and timeouts are set on the client)
+            response = self.client.get("/flights", params=self._request_params(flight_iata))
+            return self._handle_response(flight_number, flight_iata, response)
             
-            # Check if API returned any flight data
-            if not data.get('data') or len(data['data']) == 0:
-                return f"🔍 I couldn't find flight {flight_number}. Could you double-check the flight number? Airlines sometimes change flight numbers!"
+        except Exception as e:
+            return self._error_message(flight_number, e)
+    
+    def get_statuses(self, flight_numbers: List[str]) -> Dict[str, str]:
+        """
+        Retrieve status information for several flights concurrently.
+        
+        AviationStack takes one flight_iata per request, so the lookups are
+        issued in parallel over the shared client rather than one after another.
+        
+        Args:
+            flight_numbers (List[str]): Flight numbers (e.g., ["AA123", "DL456"])
             
-            # Extract first flight result (most recent)
-            flight_data = data['data'][0]
+        Returns:
+            Dict[str, str]: Status message per flight number, as passed in
+        """
+        return dict(zip(flight_numbers, self._executor.map(self.get_status, flight_numbers)))
+    
+    def _client_options(self) -> dict:
+        """Return the base URL, default params and timeout every AviationStack client uses."""
+        return {
+            'base_url': self.base_url,
+            'params': {'access_key': self.api_key},  # Sent with every request
+            'timeout': _REQUEST_TIMEOUT,
+        }
+    
+    def _request_params(self, flight_iata: str) -> dict:
+        """Build the per-lookup query parameters for the flights endpoint."""
+        return {
+            'flight_iata': flight_iata,  # Ensure uppercase for consistency
+            'limit': 1,  # Only the first (most recent) flight is used
+        }
+    
+    def _handle_response(self, flight_number: str, flight_iata: str, response) -> str:
+        """
+        Turn an AviationStack flights response into a status message and cache it.
+        
+        Args:
+            flight_number (str): Flight number as the user typed it
+            flight_iata (str): Uppercased flight number used for the lookup and cache key
+            response: httpx response from the flights endpoint
             
-            # Parse key flight information with robust null checks
-            airline_info = flight_data.get('airline') or {}
-            airline = airline_info.get('name', 'Unknown airline')
-            flight_status = flight_data.get('flight_status', 'Unknown status')
+        Returns:
+            str: Human-readable flight status information
+        """
+        try:
+            data = orjson.loads(response.content)  # Faster decode of the raw body
+        except orjson.JSONDecodeError:
+            response.raise_for_status()  # A non-JSON error page is reported by its HTTP status
+            raise
+        
+        # AviationStack reports plan and key problems as an error object, with or without an HTTP error status
+        error = data.get('error') if isinstance(data, dict) else None
+        if error:
+            return self._api_error_message(error)
+        
+        response.raise_for_status()  # Raise exception for HTTP errors
+        
+        # Check if API returned any flight data
+        if not data.get('data') or len(data['data']) == 0:
+            return f"🔍 I couldn't find flight {flight_number}. Could you double-check the flight number? Airlines sometimes change flight numbers!"
+        
+        # Extract first flight result (most recent), keeping only the fields used below
+        flight_data = _project(data['data'][0])
+        airline = flight_data['airline'].get('name', 'Unknown airline')
+        flight_status = flight_data['flight_status'] or 'Unknown status'
+        departure = flight_data['departure']
+        arrival = flight_data['arrival']
+        
+        # Missing times stay None so the checks below are plain truthiness tests
+        dep_airport, dep_scheduled, dep_actual = departure.get('airport', 'Unknown'), departure.get('scheduled'), departure.get('actual')
+        arr_airport, arr_scheduled, arr_estimated = arrival.get('airport', 'Unknown'), arrival.get('scheduled'), arrival.get('estimated')
+        
+        # Format human-readable response; unknown statuses fall back to title case
+        status_label = _STATUS_LABELS.get(flight_status) or flight_status.title()
+        parts = [
+            f"Flight {flight_iata} ({airline}) - Status: {status_label}",
+            f"From: {dep_airport} (Scheduled: {_short(dep_scheduled)})",
+            f"To: {arr_airport} (Scheduled: {_short(arr_scheduled)})",
+        ]
+        
+        # Add delay information if available (compared on the full timestamps)
+        if dep_actual and dep_actual != dep_scheduled:
+            parts.append(f"Actual Departure: {_short(dep_actual)}")
+        if arr_estimated and arr_estimated != arr_scheduled:
+            parts.append(f"Estimated Arrival: {_short(arr_estimated)}")
+        status_msg = "\n".join(parts)
+        
+        # Only successful lookups are cached, for as long as this status is likely to hold
+        ttl = _STATUS_CACHE_TTLS.get(flight_status.lower(), _DEFAULT_STATUS_TTL)
+        self._cache_put(flight_iata, status_msg, ttl)
+        return status_msg
+    
+    def _error_message(self, flight_number: str, error: Exception) -> str:
+        """Map a lookup failure to the friendly message shown to the user."""
+        if isinstance(error, httpx.TimeoutException):
+            return f"⏰ The flight data service is taking a bit longer than usual for {flight_number}. Please give it another try!"
             
-            # Extract departure information safely
-            departure = flight_data.get('departure') or {}
-            dep_airport = departure.get('airport', 'Unknown')
-            dep_scheduled = departure.get('scheduled', 'N/A')
-            dep_actual = departure.get('actual', 'N/A')
+        if isinstance(error, httpx.ConnectError):
+            return f"🌐 I'm having trouble connecting to get flight info. Could you check your internet connection and try again?"
             
-            # Extract arrival information safely
-            arrival = flight_data.get('arrival') or {}
-            arr_airport = arrival.get('airport', 'Unknown')
-            arr_scheduled = arrival.get('scheduled', 'N/A')
-            arr_estimated = arrival.get('estimated', 'N/A')
+        if isinstance(error, httpx.HTTPStatusError):
+            return f"📡 I ran into an issue with the flight data service (error {error.response.status_code}). This usually resolves quickly!"
             
-            # Format human-readable response
-            status_msg = f"Flight {flight_number} ({airline}) - Status: {flight_status.title()}\n"
-            status_msg += f"From: {dep_airport} (Scheduled: {dep_scheduled[:16] if dep_scheduled and dep_scheduled != 'N/A' else 'N/A'})\n"
-            status_msg += f"To: {arr_airport} (Scheduled: {arr_scheduled[:16] if arr_scheduled and arr_scheduled != 'N/A' else 'N/A'})"
+        return f"Unexpected error while fetching flight status: {str(error)}"
+    
+    def _api_error_message(self, error) -> str:
+        """Map an AviationStack error object to the friendly message shown to the user."""
+        code = error.get('code') if isinstance(error, dict) else None
+        if code == 'https_access_restricted':
+            return "🔒 Your AviationStack plan doesn't allow HTTPS requests. Use the default http:// base URL or upgrade your plan to keep tracking flights!"
+        
+        message = error.get('message') if isinstance(error, dict) else error
+        return f"🔑 The flight data service turned down that lookup ({code or 'error'}: {message}). Please check your AviationStack API key and plan."
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return the cached status message for key, or None if missing or expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
             
-            # Add delay information if available
-            if dep_actual and dep_actual != 'N/A' and dep_actual != dep_scheduled:
-                status_msg += f"\nActual Departure: {dep_actual[:16]}"
-            if arr_estimated and arr_estimated != 'N/A' and arr_estimated != arr_scheduled:
-                status_msg += f"\nEstimated Arrival: {arr_estimated[:16]}"
-                
+            expires_at, status_msg = entry
+            if time.monotonic() >= expires_at:
+                self._cache.pop(key, None)
+                return None
             return status_msg
+    
+    def _cache_put(self, key: str, status_msg: str, ttl: float):
+        """Store a status message for ttl seconds, evicting the oldest entry when the cache is full."""
+        with self._cache_lock:
+            if key not in self._cache and len(self._cache) >= _STATUS_CACHE_MAX_ENTRIES:
+                # Dicts preserve insertion order, so the first key is the oldest
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (time.monotonic() + ttl, status_msg)
+    
+    def clear_cache(self):
+        """Drop all cached flight statuses so the next lookups hit AviationStack again."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def close(self):
+        """Stop the batch lookup threads and close the HTTP client; the agent can't be used afterwards."""
+        self._executor.shutdown(wait=True)  # Lets in-flight lookups finish first
+        self.client.close()
+
+
+class AsyncFlightStatusAgent(FlightStatusAgent):
+    """
+    FlightStatusAgent with a non-blocking lookup for callers running an event loop.
+    
+    get_status_async awaits the AviationStack request instead of blocking, so
+    several flights can be looked up concurrently with asyncio.gather. The sync
+    get_status, response formatting and the status cache are inherited.
+    """
+    
+    def __init__(self, api_key: str, base_url: str = _DEFAULT_BASE_URL):
+        """
+        Initialize the AsyncFlightStatusAgent with AviationStack API credentials.
+        
+        Args:
+            api_key (str): AviationStack API access key
+            base_url (str): AviationStack API root, as for FlightStatusAgent
+        """
+        super().__init__(api_key, base_url)
+        
+        # Created on first use so the client binds to the caller's running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared async client (HTTP/2 over HTTPS), creating it on first use."""
+        if self._async_client is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=30.0),
+                retries=_CONNECT_RETRIES,
+            )
+            self._async_client = httpx.AsyncClient(transport=transport, **self._client_options())
+        return self._async_client
+    
+    async def get_status_async(self, flight_number: str) -> str:
+        """
+        Retrieve current status information for a specific flight without blocking the event loop.
+        
+        Args:
+            flight_number (str): Flight number (e.g., "AA123", "DL456")
             
-        except requests.exceptions.Timeout:
-            return f"⏰ The flight data service is taking a bit longer than usual for {flight_number}. Please give it another try!"
-            
-        except requests.exceptions.ConnectionError:
-            return f"🌐 I'm having trouble connecting to get flight info. Could you check your internet connection and try again?"
+        Returns:
+            str: Human-readable flight status information
+        """
+        try:
+            # Serve repeated lookups for the same flight from the in-process cache
+            flight_iata = flight_number.upper()
+            cached = self._cache_get(flight_iata)
+            if cached is not None:
+                return cached
             
-        except requests.exceptions.HTTPError as e:
-            return f"📡 I ran into an issue with the flight data service (error {e.response.status_code}). This usually resolves quickly!"
+            client = self._get_async_client()
+            response = await client.get("/flights", params=self._request_params(flight_iata))
+            return self._handle_response(flight_number, flight_iata, response)
             
         except Exception as e:
-            return f"Unexpected error while fetching flight status: {str(e)}" 
\ No newline at end of file
+            return self._error_message(flight_number, e)
+    
+    async def get_statuses_async(self, flight_numbers: List[str]) -> Dict[str, str]:
+        """
+        Retrieve status information for several flights concurrently on the event loop.
+        
+        Args:
+            flight_numbers (List[str]): Flight numbers (e.g., ["AA123", "DL456"])
+            
+        Returns:
+            Dict[str, str]: Status message per flight number, as passed in
+        """
+        statuses = await asyncio.gather(*(self.get_status_async(flight_number) for flight_number in flight_numbers))
+        return dict(zip(flight_numbers, statuses))
+    
+    async def aclose(self):
+        """Close the async HTTP client, then release the sync client and lookup threads via close()."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
@@ -1,20 +1,140 @@
 import re
 import logging
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Dict, Final
+
+from agents.airport_codes import AIRPORT_CODES, NON_AIRPORT_WORDS
+
+try:
+    import ahocorasick
+except ImportError:  # Without pyahocorasick, phrase lists are matched with a regex alternation
+    ahocorasick = None
+
+# Logger for routing decisions, used directly rather than through an instance attribute.
+# Handlers are left to the application entry point (main.py calls logging.basicConfig);
+# the level is left alone unless a router is given an explicit log_level.
+logger = logging.getLogger(__name__)
+
+# Fixed replies, built once rather than on every routed query
+EMPTY_QUERY: Final[str] = "💭 I'd love to help! Could you tell me what you'd like to know about flights? Try asking about a flight status or airline performance."
+ANALYTICS_UNAVAILABLE: Final[str] = "📊 Delay analytics are taking a quick break (BigQuery is resting). How about checking a specific flight status instead?"
+STATUS_NEEDS_NUMBER: Final[str] = "✈️ I'd love to help with that flight! Please include a flight number like 'What's the status of AA123?'"
+HELP_MESSAGE: Final[str] = ("I can help with two types of queries:\n"
+                            "1. Flight status: Include a flight number (e.g., 'What's the status of AA123?')\n"
+                            "2. Delay analysis: Ask about on-time performance, delays, or best days to fly (e.g., 'What are the most on-time airlines from SFO to JFK?')")
+
+# Error replies; the placeholder is filled with the exception raised by the worker agent
+_STATUS_ERROR_FMT: Final[str] = "😞 I ran into an issue checking that flight: {}"
+_DELAY_ERROR_FMT: Final[str] = "😅 I encountered a hiccup getting that delay information: {}"
+_ANALYSIS_ERROR_FMT: Final[str] = "📈 I hit a small bump analyzing that data: {}"
+
+# LLM classification system prompt - updated for delay vs status with context awareness
+_LLM_SYSTEM_PROMPT: Final[str] = '''You are a flight query classifier. Reply exactly "status" or "delay".
+
+STATUS queries: Ask about specific flight numbers (e.g., "AA123", "DL456"). Examples:
+- "What's the status of AA123?"
+- "Is flight UA456 on time?"
+
+DELAY queries: Ask about airlines, routes, delays, on-time performance, or day-of-week analysis between airports. Examples:
+- "What are the most on-time airlines from SFO to JFK?"
+- "Which day has fewer delays from EWR to ORD?" 
+- "Show me airlines with best performance"
+
+Follow-up phrases like "what about" should usually maintain the same type as previous queries.'''
+
+# Everything before the user query is fixed, so it is built once for every router
+_LLM_PROMPT_PREFIX: Final[str] = _LLM_SYSTEM_PROMPT + "\n\nUser query: "
+
+
+class _PhraseAutomaton:
+    """Aho-Corasick matcher over a phrase list with the same search() test as a compiled regex."""
+    
+    def __init__(self, phrases: list[str]):
+        self._automaton = ahocorasick.Automaton()
+        for phrase in phrases:
+            self._automaton.add_word(phrase, phrase)
+        self._automaton.make_automaton()
+    
+    def search(self, text: str) -> str | None:
+        """Return the first phrase found in text, or None; the scan stops at the first hit."""
+        hit = next(self._automaton.iter(text), None)
+        return hit[1] if hit else None
+
+
+def _compile_phrases(phrases: list[str]) -> Any:
+    """
+    Build a matcher that finds any of the phrases as a substring in one pass.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, so the scan
+    cost stays flat as the list grows; otherwise a single escaped alternation.
+    """
+    if ahocorasick is not None:
+        return _PhraseAutomaton(phrases)
+    return re.compile('|'.join(map(re.escape, phrases)))
 
 
 class InquiryRouterAgent:
     """Agent responsible for routing user queries to appropriate specialized agents based on query content."""
     
-    def __init__(self, status_agent: Any, analytics_agent: Any, use_llm: bool = False, llm_client: Any = None):
+    # Longer queries are truncated before any scanning, casing or LLM call
+    MAX_QUERY_LENGTH = 2048
+    
+    # Queries shorter than this (in characters or words) are a bare flight number or too
+    # terse to disambiguate, so they are routed by the regex scan without asking the LLM
+    MIN_LLM_QUERY_LENGTH = 10
+    MIN_LLM_QUERY_WORDS = 3
+    
+    # Shortest start of a label ("sta", "del") accepted from a partial, streamed LLM reply
+    MIN_LABEL_PREFIX = 3
+    
+    # Patterns and phrase matchers are compiled once at import and shared by every router
+    
+    # Flight number pattern (2-3 letters + 2-4 digits, either case; uppercase matches before use).
+    # Kept only for backward compatibility with callers that read it: routing does not use it,
+    # flight numbers are found by _tokenize_and_classify.
+    flight_number_pattern = re.compile(r'\b[A-Za-z]{2,3}\d{2,4}\b')
+    
+    # A \b-delimited token is a whole run of word characters, so splitting on non-word
+    # characters yields exactly the candidates for flight numbers and airport codes
+    _WORD_SPLIT_RE = re.compile(r'\W+')
+    
+    # Follow-up phrases and delay keywords, each compiled into one matcher so a
+    # query is scanned once per list (substring matches, like the original phrase checks)
+    _FOLLOW_UP_PHRASES = ['what about', 'how about', 'and for', 'what if']
+    _DELAY_KEYWORDS = [
+        'delay', 'delays', 'on-time', 'on time', 'performance', 'airlines', 
+        'best', 'worst', 'day of week', 'weekday', 'monday', 'tuesday', 
+        'wednesday', 'thursday', 'friday', 'saturday', 'sunday', 'analytics',
+        'analysis', 'compare', 'comparison', 'ranking', 'rank'
+    ]
+    follow_up_matcher = _compile_phrases(_FOLLOW_UP_PHRASES)
+    delay_matcher = _compile_phrases(_DELAY_KEYWORDS)
+    
+    # Route method per agent name, shared by follow-ups and LLM decisions; each route
+    # takes (query, flight_numbers); the agent name is what last_agent_used records
+    _ROUTES = {'status': '_route_to_status', 'analytics': '_route_to_analytics'}
+    
+    # Agent name for each label _classify_with_llm can return
+    _LLM_DISPATCH = {'status': 'status', 'delay': 'analytics'}
+    
+    # Normalization for the LLM classification cache key
+    _NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
+    def __init__(self, status_agent: Any, analytics_agent: Any, use_llm: bool = False, llm_client: Any = None,
+                 log_level: int | None = None):
         """
         Initialize the InquiryRouterAgent with worker agents.
         
         Args:
-            status_agent: Agent instance with get_status(flight_number: str) -> str method
+            status_agent: Agent instance with get_status(flight_number: str) -> str method; an optional
+                get_statuses(flight_numbers: list[str]) -> dict[str, str] is used for multi-flight queries
             analytics_agent: Agent instance with analyze_flight_data(query: str) -> str method for delay analytics
             use_llm (bool): Whether to use LLM for query classification. Defaults to False.
             llm_client: LLM client function that takes a prompt and returns a response
+            log_level (int, optional): Level to set on this module's logger. The logger is shared
+                by every router, so it is only changed when a level is passed; defaults to None,
+                which leaves the application's logging configuration untouched.
         """
         self.status_agent = status_agent
         self.analytics_agent = analytics_agent
@@ -25,37 +145,32 @@ class InquiryRouterAgent:
         self.last_agent_used: str | None = None  # 'status' or 'analytics'
         self.last_query_type: str | None = None  # Track what type of query was last processed
         
-        # Set up logging for routing decisions
-        logging.basicConfig(level=logging.WARNING)
-        self.logger = logging.getLogger(__name__)
+        if log_level is not None:
+            logger.setLevel(log_level)
         
-        # Regex pattern to detect flight numbers (2-3 uppercase letters + 2-4 digits)
-        self.flight_number_pattern = re.compile(r'\b[A-Z]{2,3}\d{2,4}\b')
+        # LLM classification system prompt and the fixed prompt text before the user query
+        self.llm_system_prompt = _LLM_SYSTEM_PROMPT
+        self._llm_prefix = _LLM_PROMPT_PREFIX
         
-        # LLM classification system prompt - updated for delay vs status with context awareness
-        self.llm_system_prompt = '''You are a flight query classifier. Reply exactly "status" or "delay".
-
-STATUS queries: Ask about specific flight numbers (e.g., "AA123", "DL456"). Examples:
-- "What's the status of AA123?"
-- "Is flight UA456 on time?"
-
-DELAY queries: Ask about airlines, routes, delays, on-time performance, or day-of-week analysis between airports. Examples:
-- "What are the most on-time airlines from SFO to JFK?"
-- "Which day has fewer delays from EWR to ORD?" 
-- "Show me airlines with best performance"
-
-Follow-up phrases like "what about" should usually maintain the same type as previous queries.'''
+        # Recent LLM classifications keyed by normalized query text (least recently used first)
+        self._llm_cache: OrderedDict[str, str] = OrderedDict()
+        self._llm_cache_size = 2048
         
         if self.use_llm and not self.llm_client:
-            self.logger.warning("LLM routing enabled but no llm_client provided, falling back to regex")
+            logger.warning("LLM routing enabled but no llm_client provided, falling back to regex")
             self.use_llm = False
         
-        routing_method = "LLM + regex fallback" if self.use_llm else "regex only"
+        if logger.isEnabledFor(logging.INFO):
+            routing_method = "LLM + regex fallback" if self.use_llm else "regex only"
+            logger.info("InquiryRouterAgent initialized with %s routing", routing_method)
     
     def handle_query(self, query: str) -> str:
         """
         Route user query to appropriate agent based on content analysis.
         
+        Queries longer than MAX_QUERY_LENGTH characters (after stripping) are
+        truncated, which bounds the regex scans and the LLM prompt size.
+        
         Args:
             query (str): User's travel-related query
             
@@ -63,149 +178,260 @@ Follow-up phrases like "what about" should usually maintain the same type as pre
             str: Response from the appropriate agent or error message
         """
         if not query or not query.strip():
-            self.logger.warning("Empty query received")
-            return "💭 I'd love to help! Could you tell me what you'd like to know about flights? Try asking about a flight status or airline performance."
+            logger.warning("Empty query received")
+            return EMPTY_QUERY
         
-        query_clean = query.strip()
+        query_clean = query.strip()[:self.MAX_QUERY_LENGTH]
+        query_lower = query_clean.lower()
+        
+        # Classify the query's tokens once; every route below reuses the result
+        tokens = self._tokenize_and_classify(query_clean)
+        flight_numbers = tokens['flight_numbers']
+        has_airport_codes = tokens['has_airport_codes']
         
         # Check for follow-up phrases that should use conversational memory
-        follow_up_phrases = ['what about', 'how about', 'and for', 'what if']
-        is_follow_up = any(phrase in query_clean.lower() for phrase in follow_up_phrases)
+        is_follow_up = bool(self.follow_up_matcher.search(query_lower))
         
-        if is_follow_up and self.last_agent_used:
-            if self.last_agent_used == "analytics":
-                result = self._route_to_analytics(query_clean)
-                self.last_agent_used = "analytics"
-                return result
-            elif self.last_agent_used == "status":
-                result = self._route_to_status(query_clean)
-                self.last_agent_used = "status"
-                return result
+        if is_follow_up and self.last_agent_used in self._ROUTES:
+            return self._dispatch(self.last_agent_used, query_clean, flight_numbers)
         
-        # Try LLM classification first if enabled
-        if self.use_llm:
-            llm_decision = self._classify_with_llm(query_clean)
-            if llm_decision == "status":
-                result = self._route_to_status(query_clean)
-                self.last_agent_used = "status"
-                return result
-            elif llm_decision == "delay":
-                result = self._route_to_analytics(query_clean)
-                self.last_agent_used = "analytics"
-                return result
-            # If LLM fails or returns unknown, fall back to regex
-            pass
+        # Delay keywords are checked before any LLM call
+        has_delay_keywords = bool(self.delay_matcher.search(query_lower))
         
-        # Search for flight number pattern in the query (regex fallback or primary method)
-        flight_number_match = self.flight_number_pattern.search(query_clean.upper())
+        # A flight number, a typed airport code plus a delay keyword, or a route plus a year
+        # ("SFO to JFK in 2013") is unambiguous; the LLM is only asked to resolve queries
+        # the regex can't classify confidently. Only catalogued codes count here: any 3-letter
+        # word sets has_airport_codes ("any delay to see my mom"), which is fine for the
+        # regex fallback but too loose to skip the classifier.
+        airports = tokens['airports']
+        regex_is_confident = (bool(flight_numbers) or (bool(airports) and has_delay_keywords) or
+                              (len(airports) >= 2 and tokens['year'] is not None))
         
-        if flight_number_match:
+        # Try LLM classification first if enabled and the query is long enough to need it
+        if self.use_llm and not regex_is_confident and not self._too_short_for_llm(query_clean):
+            agent_name = self._LLM_DISPATCH.get(self._classify_with_llm(query_clean, query_lower))
+            if agent_name:
+                return self._dispatch(agent_name, query_clean, flight_numbers)
+            # If LLM fails or returns unknown, fall back to regex
+        
+        # Route on the regex scan (fallback or primary method)
+        if flight_numbers:
             # Flight number detected - route to status agent
-            flight_number = flight_number_match.group()
             
             try:
-                result = self.status_agent.get_status(flight_number)
+                result = self._lookup_statuses(flight_numbers)
                 self.last_agent_used = "status"
                 return result
             except Exception as e:
-                self.logger.error(f"Error calling status agent: {str(e)}")
-                return f"😞 I ran into an issue checking that flight: {str(e)}"
+                logger.error("Error calling status agent: %s", e)
+                return _STATUS_ERROR_FMT.format(e)
         
         else:
             # No flight number detected - check for delay analysis keywords
-            delay_keywords = [
-                'delay', 'delays', 'on-time', 'on time', 'performance', 'airlines', 
-                'best', 'worst', 'day of week', 'weekday', 'monday', 'tuesday', 
-                'wednesday', 'thursday', 'friday', 'saturday', 'sunday', 'analytics',
-                'analysis', 'compare', 'comparison', 'ranking', 'rank'
-            ]
-            
-            has_delay_keywords = any(keyword in query_clean.lower() for keyword in delay_keywords)
-            has_airport_codes = bool(re.search(r'\b[A-Z]{3}\b', query_clean.upper()))
-            
             if has_delay_keywords or has_airport_codes:
                 # Route to analytics agent
                 
                 # Check if analytics agent is available
                 if not self.analytics_agent:
-                    return "📊 Delay analytics are taking a quick break (BigQuery is resting). How about checking a specific flight status instead?"
+                    return ANALYTICS_UNAVAILABLE
                 
                 try:
                     result = self.analytics_agent.analyze_flight_data(query_clean)
                     self.last_agent_used = "analytics"
                     return result
                 except Exception as e:
-                    self.logger.error(f"Error calling analytics agent: {str(e)}")
-                    return f"😅 I encountered a hiccup getting that delay information: {str(e)}"
+                    logger.error("Error calling analytics agent: %s", e)
+                    return _DELAY_ERROR_FMT.format(e)
             
             else:
                 # Could not determine query type
-                self.logger.warning("Could not determine query type")
-                return ("I can help with two types of queries:\n"
-                       "1. Flight status: Include a flight number (e.g., 'What's the status of AA123?')\n"
-                       "2. Delay analysis: Ask about on-time performance, delays, or best days to fly (e.g., 'What are the most on-time airlines from SFO to JFK?')")
+                logger.warning("Could not determine query type")
+                return HELP_MESSAGE
     
-    def _classify_with_llm(self, query: str) -> str | None:
+    def clear_cache(self):
+        """
+        Drop cached LLM classifications and any results cached by the worker agents.
+        
+        Whole responses are not cached here: follow-ups like "what about LAX?" depend
+        on conversational memory, so the same text can need a different answer.
+        """
+        self._llm_cache.clear()
+        for agent in (self.status_agent, self.analytics_agent):
+            if agent is not None and hasattr(agent, "clear_cache"):
+                agent.clear_cache()
+    
+    def _tokenize_and_classify(self, query: str) -> Dict[str, Any]:
+        """
+        Classify the tokens of a query in a single pass: flight numbers, airport codes and years.
+        
+        Letters are matched in either case, so the query is not uppercased as a
+        whole; only the tokens kept are. A flight number anywhere in the query takes
+        precedence over airport codes that appear before it, so "SFO to JFK on AA123"
+        still routes to status.
+        
+        Args:
+            query (str): User query, in any case
+            
+        Returns:
+            Dict[str, Any]: Token classes found in the query:
+                - flight_numbers: distinct uppercased flight numbers in order of appearance
+                - has_airport_codes: True if any standalone 3-letter word was seen
+                - airports: distinct catalogued airport codes typed in uppercase, in order of
+                  appearance; words like "Can" or "sun" and NON_AIRPORT_WORDS are left out
+                - year: first year (19xx or 20xx) mentioned, or None
+        """
+        flight_numbers: list[str] = []
+        has_airport_codes = False
+        airports: list[str] = []
+        year = None
+        for token in self._WORD_SPLIT_RE.split(query):
+            length = len(token)
+            if length == 3:
+                if token.isascii() and token.isalpha():
+                    has_airport_codes = True
+                    # Several catalogued codes are also English words (CAN, SUN, MAN), so only
+                    # codes the user typed as codes count toward a route
+                    if (token.isupper() and token in AIRPORT_CODES and token not in NON_AIRPORT_WORDS
+                            and token not in airports):
+                        airports.append(token)
+            elif 3 < length < 8 and token[-1].isdecimal():
+                if length == 4 and token[:2] in ('19', '20') and token[2:].isdecimal():
+                    if year is None:
+                        year = int(token)
+                # [A-Za-z]{2,3} then 2-4 digits; isdecimal() accepts the same Unicode digits as \d
+                elif ((length <= 6 and token[:2].isascii() and token[:2].isalpha() and token[2:].isdecimal()) or
+                        (length >= 5 and token[:3].isascii() and token[:3].isalpha() and token[3:].isdecimal())):
+                    flight_number = token.upper()
+                    if flight_number not in flight_numbers:
+                        flight_numbers.append(flight_number)
+        
+        return {
+            'flight_numbers': flight_numbers,
+            'has_airport_codes': has_airport_codes,
+            'airports': airports,
+            'year': year,
+        }
+    
+    def _too_short_for_llm(self, query: str) -> bool:
+        """Check whether a stripped query is below MIN_LLM_QUERY_LENGTH characters or MIN_LLM_QUERY_WORDS words."""
+        if len(query) < self.MIN_LLM_QUERY_LENGTH:
+            return True
+        # Only the first few words need splitting off to know there are enough
+        return len(query.split(None, self.MIN_LLM_QUERY_WORDS - 1)) < self.MIN_LLM_QUERY_WORDS
+    
+    def _classify_with_llm(self, query: str, query_lower: str | None = None) -> str | None:
         """
         Use LLM to classify the query intent.
         
         Args:
             query (str): User query string
+            query_lower (str, optional): Lowercased query, if the caller already has one
             
         Returns:
             str | None: "status", "delay", or None if classification fails
         """
+        query = query[:self.MAX_QUERY_LENGTH]  # Don't pay for an oversized prompt
+        if query_lower is None:
+            query_lower = query.lower()
+        
+        # Repeated or re-punctuated queries reuse the earlier classification
+        cache_key = self._normalize_query(query_lower)
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            self._llm_cache.move_to_end(cache_key)
+            return cached
+        
         try:
             # Construct prompt with system message and user query
-            prompt = f"{self.llm_system_prompt}\n\nUser query: {query}"
+            prompt = self._llm_prefix + query
             
             response = self.llm_client(prompt)
             
-            # Parse LLM response
+            # Parse LLM response, keyed on the first word so "Status." or "delay\n..." still count;
+            # a streamed client may return only the start of the word ("sta"), so a prefix of at
+            # least MIN_LABEL_PREFIX letters counts as well (single letters are still rejected)
             if isinstance(response, str):
                 response_clean = response.strip().lower()
-                if response_clean == "status":
-                    return "status"
-                elif response_clean == "delay":
-                    return "delay"
+                first_word = response_clean.split(None, 1)[0].strip('."\'`*:') if response_clean else ""
+                is_prefix = len(first_word) >= self.MIN_LABEL_PREFIX
+                if first_word.startswith("status") or (is_prefix and "status".startswith(first_word)):
+                    return self._remember_classification(cache_key, "status")
+                elif first_word.startswith("delay") or (is_prefix and "delay".startswith(first_word)):
+                    return self._remember_classification(cache_key, "delay")
                 else:
-                    self.logger.warning(f"LLM returned unexpected response: {response_clean}")
+                    logger.warning("LLM returned unexpected response: %s", response_clean)
                     return None
             else:
-                self.logger.warning(f"LLM returned non-string response: {type(response)}")
+                logger.warning("LLM returned non-string response: %s", type(response))
                 return None
                 
         except Exception as e:
-            self.logger.error(f"Error during LLM classification: {str(e)}")
+            logger.error("Error during LLM classification: %s", e)
             return None
     
-    def _route_to_status(self, query: str) -> str:
+    def _normalize_query(self, query_lower: str) -> str:
+        """Drop punctuation from a lowercased query and collapse whitespace for the classification cache."""
+        stripped = self._NON_ALNUM_RE.sub('', query_lower)
+        return self._WHITESPACE_RE.sub(' ', stripped).strip()
+    
+    def _remember_classification(self, cache_key: str, decision: str) -> str:
+        """Cache a successful LLM classification, evicting the least recently used one when full."""
+        self._llm_cache[cache_key] = decision
+        self._llm_cache.move_to_end(cache_key)
+        if len(self._llm_cache) > self._llm_cache_size:
+            self._llm_cache.popitem(last=False)
+        return decision
+    
+    def _dispatch(self, agent_name: str, query: str, flight_numbers: list[str]) -> str:
+        """Run the route for agent_name (a key of _ROUTES) and remember it for follow-ups."""
+        result = getattr(self, self._ROUTES[agent_name])(query, flight_numbers)
+        self.last_agent_used = agent_name
+        return result
+    
+    def _route_to_status(self, query: str, flight_numbers: list[str] | None = None) -> str:
         """Route query to status agent, extracting flight number if needed."""
-        # Try to extract flight number from query
-        flight_number_match = self.flight_number_pattern.search(query.upper())
+        # Reuse the caller's scan of the query when given, otherwise extract flight numbers here
+        if flight_numbers is None:
+            flight_numbers = self._tokenize_and_classify(query)['flight_numbers']
         
-        if flight_number_match:
-            flight_number = flight_number_match.group()
-            
+        if flight_numbers:
             try:
-                result = self.status_agent.get_status(flight_number)
+                result = self._lookup_statuses(flight_numbers)
                 return result
             except Exception as e:
-                self.logger.error(f"Error calling status agent: {str(e)}")
-                return f"😞 I ran into an issue checking that flight: {str(e)}"
+                logger.error("Error calling status agent: %s", e)
+                return _STATUS_ERROR_FMT.format(e)
         else:
-            self.logger.warning("LLM classified as status but no flight number found")
-            return "✈️ I'd love to help with that flight! Please include a flight number like 'What's the status of AA123?'"
+            logger.warning("LLM classified as status but no flight number found")
+            return STATUS_NEEDS_NUMBER
+    
+    def _lookup_statuses(self, flight_numbers: list[str]) -> str:
+        """
+        Fetch the status of one or more flights from the status agent.
+        
+        Several flight numbers in one query are looked up together through the
+        agent's get_statuses when it has one, and the answers are joined in order.
+        
+        Args:
+            flight_numbers (list[str]): Distinct flight numbers found in the query
+            
+        Returns:
+            str: Status message, or one per flight separated by blank lines
+        """
+        if len(flight_numbers) > 1 and hasattr(self.status_agent, "get_statuses"):
+            statuses = self.status_agent.get_statuses(flight_numbers)
+            return "\n\n".join(statuses[flight_number] for flight_number in flight_numbers)
+        return self.status_agent.get_status(flight_numbers[0])
     
-    def _route_to_analytics(self, query: str) -> str:
-        """Route query to analytics agent for delay analysis."""
+    def _route_to_analytics(self, query: str, flight_numbers: list[str] | None = None) -> str:
+        """Route query to analytics agent for delay analysis (flight_numbers is unused, see _ROUTES)."""
         # Check if analytics agent is available
         if not self.analytics_agent:
-            return "📊 Delay analytics are taking a quick break (BigQuery is resting). How about checking a specific flight status instead?"
+            return ANALYTICS_UNAVAILABLE
         
         try:
             result = self.analytics_agent.analyze_flight_data(query)
             return result
         except Exception as e:
-            self.logger.error(f"Error calling analytics agent: {str(e)}")
-            return f"📈 I hit a small bump analyzing that data: {str(e)}" 
\ No newline at end of file
+            logger.error("Error calling analytics agent: %s", e)
+            return _ANALYSIS_ERROR_FMT.format(e) 
\ No newline at end of file
@@ -4,6 +4,7 @@ SkyRoute Agents - Smart Travel Assistant
 Interactive command-line interface for flight status and delay analytics queries.
 """
 
+import logging
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -12,11 +13,39 @@ from agents.flight_analytics_agent import FlightAnalyticsAgent
 from agents.inquiry_router import InquiryRouterAgent
 
 
+# Gemini model used to classify queries; set by main() when a GEMINI_API_KEY is configured
+_MODEL = None
+
+
+def _llm_client(prompt: str) -> str:
+    """
+    Classify a routing prompt with the Gemini model.
+    
+    The router only reads the first word of the reply, so the response is streamed
+    and the first text to arrive is returned instead of waiting for the rest.
+    
+    Args:
+        prompt (str): Full classification prompt built by InquiryRouterAgent
+        
+    Returns:
+        str: Text of the first non-empty response chunk, or "" if there was none
+    """
+    for chunk in _MODEL.generate_content(prompt, stream=True):
+        if chunk.parts:
+            return chunk.text
+    return ""
+
+
 def main():
     """Main function to run the SkyRoute Agents Smart Travel Assistant."""
+    global _MODEL
+    
     print("✈️  Welcome to SkyRoute Agents - Your Smart Travel Assistant! ✈️")
     print("=" * 65)
     
+    # Only show warnings and errors from the agents
+    logging.basicConfig(level=logging.WARNING)
+    
     # Load environment variables from .env file
     load_dotenv()
     
@@ -36,11 +65,17 @@ def main():
     if gemini_key:
         try:
             genai.configure(api_key=gemini_key)
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            def llm_client(prompt):
-                response = model.generate_content(prompt)
-                return response.text
+            # The model is only used as a one-word classifier: cap the reply at a few
+            # tokens and decode greedily so the same query always gets the same label
+            _MODEL = genai.GenerativeModel(
+                'gemini-1.5-flash',
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=4,
+                    temperature=0.0,
+                    top_k=1,
+                ),
+            )
+            llm_client = _llm_client
             
             use_llm = True
             print("🤖 Great! I've connected to Gemini AI for smarter query understanding")
@@ -85,33 +120,39 @@ def main():
     
     print("💡 Tip: I understand natural language, so feel free to ask however feels comfortable!\n")
     
-    while True:
-        try:
-            # Get user input
-            user_query = input("🗣️  Ask me anything: ").strip()
-            
-            # Check for exit condition
-            if user_query.lower() == 'exit':
-                print("\n👋 Thanks for using SkyRoute Agents! Have a great trip! ✈️")
+    try:
+        while True:
+            try:
+                # Get user input
+                user_query = input("🗣️  Ask me anything: ").strip()
+                
+                # Check for exit condition
+                if user_query.lower() == 'exit':
+                    print("\n👋 Thanks for using SkyRoute Agents! Have a great trip! ✈️")
+                    break
+                
+                # Skip empty queries
+                if not user_query:
+                    print("💭 I'm here when you're ready to ask something!")
+                    continue
+                
+                # Route query and get response
+                print("\n🤔 Let me check that for you...")
+                response = router.handle_query(user_query)
+                print(f"\n{response}\n")
+                print("-" * 55)
+                
+            except KeyboardInterrupt:
+                print("\n\n👋 Thanks for using SkyRoute Agents! Safe travels! ✈️")
                 break
-            
-            # Skip empty queries
-            if not user_query:
-                print("💭 I'm here when you're ready to ask something!")
-                continue
-            
-            # Route query and get response
-            print("\n🤔 Let me check that for you...")
-            response = router.handle_query(user_query)
-            print(f"\n{response}\n")
-            print("-" * 55)
-            
-        except KeyboardInterrupt:
-            print("\n\n👋 Thanks for using SkyRoute Agents! Safe travels! ✈️")
-            break
-        except Exception as e:
-            print(f"😅 Oops, something unexpected happened: {e}")
-            print("💡 Please try rephrasing your question or check your connection")
+            except Exception as e:
+                print(f"😅 Oops, something unexpected happened: {e}")
+                print("💡 Please try rephrasing your question or check your connection")
+    finally:
+        # Release the agents' HTTP connections and worker threads, however the session ended
+        status_agent.close()
+        if analytics_agent is not None:
+            analytics_agent.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Checks InquiryRouterAgent's token scan against a regex reference implementation.
+
+_tokenize_and_classify splits the query on non-word characters and tests each token
+by hand; the reference below finds the same token classes with word-boundary regexes,
+which is how the router detected flight numbers and airport codes originally.
+"""
+
+import random
+import re
+import unittest
+
+from agents.airport_codes import AIRPORT_CODES, NON_AIRPORT_WORDS
+from agents.inquiry_router import InquiryRouterAgent
+
+# Flight numbers | standalone 3-letter airport codes | years, as the analytics agent reads them
+_TOKEN_RE = re.compile(
+    r'\b(?P<flight>[A-Za-z]{2,3}\d{2,4})\b'
+    r'|\b(?P<airport>[A-Za-z]{3})\b'
+    r'|\b(?P<year>(?:19|20)\d{2})\b'
+)
+
+
+def _classify_with_regex(query: str) -> dict:
+    """Regex reference for InquiryRouterAgent._tokenize_and_classify."""
+    flight_numbers = []
+    has_airport_codes = False
+    airports = []
+    year = None
+    for match in _TOKEN_RE.finditer(query):
+        kind = match.lastgroup
+        text = match.group(kind)
+        value = text.upper()
+        if kind == 'flight':
+            if value not in flight_numbers:
+                flight_numbers.append(value)
+        elif kind == 'airport':
+            has_airport_codes = True
+            if (text == value and value in AIRPORT_CODES and value not in NON_AIRPORT_WORDS
+                    and value not in airports):
+                airports.append(value)
+        elif year is None:
+            year = int(value)
+    return {
+        'flight_numbers': flight_numbers,
+        'has_airport_codes': has_airport_codes,
+        'airports': airports,
+        'year': year,
+    }
+
+
+class TokenizeAndClassifyTest(unittest.TestCase):
+    """_tokenize_and_classify must agree with the regex reference."""
+
+    # Whole words worth hitting often, plus ASCII and non-ASCII characters that stress \w, \d and casing
+    _WORDS = ['sfo', 'JFK', 'ewr', 'the', 'day', 'DAY', 'CAN', '2013', '1999', '2100', '20١٣',
+              'aa123', 'DL4567', '19', '201', 'can']
+    _ALPHABET = (list("AaBbcDdEfGgZz0123456789  _-.,/?!'\t\n") +
+                 ['É', 'ß', 'İ', '١', '²', '٣', 'ǅ', 'Ⅻ', '𝟘', 'ﬀ', 'Ａ', 'µ', 'Σ', 'ſ', 'ı', 'K'] +
+                 _WORDS * 2)
+
+    def setUp(self):
+        self.router = InquiryRouterAgent(None, None)
+
+    def test_examples(self):
+        examples = [
+            "What's the status of AA123?",
+            "aa123 and DL456 status",
+            "most on-time airlines from SFO to JFK in 2013",
+            "Can I bring my dog on the Sun Country flight in 2024?",
+            "Is there any delay on my flight to see my mom tonight?",
+            "flight ABCD1234 from DAY",
+            "",
+        ]
+        for query in examples:
+            with self.subTest(query=query):
+                self.assertEqual(self.router._tokenize_and_classify(query), _classify_with_regex(query))
+
+    def test_random_queries(self):
+        rnd = random.Random(0)
+        for _ in range(20000):
+            query = ''.join(rnd.choice(self._ALPHABET) for _ in range(rnd.randint(0, 24)))
+            self.assertEqual(self.router._tokenize_and_classify(query), _classify_with_regex(query), repr(query))
+
+
+if __name__ == '__main__':
+    unittest.main()